@@ -39,7 +39,25 @@ class APILoggerSize:
                                          " units: K (kilobytes), M (megabytes). For instance: 45M") from None
 
         self.size = int(size) * self.unit_conversion[unit]
-        if self.size < self.unit_conversion['M']:
+        self.check_minimum_size(self.size, size_string)
+
+    @classmethod
+    def check_minimum_size(cls, size: int, size_string: str):
+        """Check that a log file size is not lower than 1M.
+
+        Parameters
+        ----------
+        size : int
+            Size in bytes.
+        size_string : str
+            Size as specified in the configuration.
+
+        Raises
+        ------
+        APIError(2011)
+            If the size is lower than 1M.
+        """
+        if size < cls.unit_conversion['M']:
             raise APIError(2011, details=f"Minimum value for size is 1M. Current: {size_string}")
 
 
@@ -196,7 +214,8 @@ def set_logging(log_filepath, logging_config: RotatedLoggingConfig, foreground_m
     for handler, d in handlers.items():
         if d and 'filename' in d:
             if logging_config.max_size.enabled:
-                max_size = APILoggerSize(logging_config.max_size.size).size
+                max_size = logging_config.max_size.get_size_bytes()
+                APILoggerSize.check_minimum_size(max_size, logging_config.max_size.size)
                 d.update({
                     'class':'wazuh.core.wlogging.SizeBasedFileRotatingHandler',
                     'maxBytes': max_size,
@@ -0,0 +1,85 @@
+import logging
+from unittest.mock import Mock, patch
+
+from gunicorn.config import Config
+
+from comms_api.core import worker as worker_module
+from comms_api.core.worker import CommsAPILogger, CommsAPIWorker, load_ssl_context
+
+
+def test_comms_api_logger():
+    """Check that the `CommsAPILogger` keeps only the handlers configured for the gunicorn loggers."""
+    handler = logging.NullHandler()
+    error_log = logging.getLogger('gunicorn.error')
+
+    with patch.object(error_log, 'handlers', [handler]):
+        CommsAPILogger(Config())
+        assert error_log.handlers == [handler]
+
+
+def test_comms_api_worker_config_kwargs():
+    """Check that the `CommsAPIWorker` forces the uvloop event loop and the httptools HTTP parser."""
+    assert CommsAPIWorker.CONFIG_KWARGS['loop'] == 'uvloop'
+    assert CommsAPIWorker.CONFIG_KWARGS['http'] == 'httptools'
+
+
+@patch('comms_api.core.worker.UvicornWorker.run')
+@patch('comms_api.core.worker.UvicornWorker.__init__', return_value=None)
+def test_comms_api_worker_run(worker_init_mock, worker_run_mock):
+    """Check that the `run` method uses the SSL context created by the arbiter."""
+    worker = CommsAPIWorker()
+    worker.wsgi = Mock()
+    worker.config = Mock()
+    ssl_context = Mock()
+
+    with patch('comms_api.core.worker._ssl_context', ssl_context):
+        worker.run()
+
+    worker.config.load.assert_called_once()
+    assert worker.config.app == worker.wsgi
+    assert worker.config.ssl == ssl_context
+    worker_run_mock.assert_called_once()
+
+
+@patch('comms_api.core.worker.UvicornWorker.run')
+@patch('comms_api.core.worker.UvicornWorker.__init__', return_value=None)
+def test_comms_api_worker_run_no_ssl(worker_init_mock, worker_run_mock):
+    """Check that the `run` method does not set the arbiter SSL context without SSL."""
+    worker = CommsAPIWorker()
+    worker.wsgi = Mock()
+    worker.config = Mock(ssl=None)
+
+    with patch('comms_api.core.worker._ssl_context', Mock()):
+        worker.run()
+
+    assert worker.config.ssl is None
+    worker_run_mock.assert_called_once()
+
+
+@patch('comms_api.core.worker.create_ssl_context')
+def test_load_ssl_context(create_ssl_context_mock):
+    """Check that the `load_ssl_context` hook applies the gunicorn `ssl_context` hook to the default SSL context."""
+    server = Mock()
+    server.cfg.ssl_options = {'certfile': 'cert.pem', 'keyfile': 'key.pem'}
+
+    with patch('comms_api.core.worker._ssl_context', None):
+        load_ssl_context(server)
+        assert worker_module._ssl_context == server.cfg.ssl_context.return_value
+
+    server.cfg.ssl_context.assert_called_once()
+    assert server.cfg.ssl_context.call_args[0][0] == server.cfg
+    assert server.cfg.ssl_context.call_args[0][1]() == create_ssl_context_mock.return_value
+    create_ssl_context_mock.assert_called_once_with(certfile='cert.pem', keyfile='key.pem', password=None,
+                                                    ssl_version=None, cert_reqs=None, ca_certs=None, ciphers=None)
+
+
+def test_load_ssl_context_no_ssl():
+    """Check that the `load_ssl_context` hook does not create an SSL context without SSL."""
+    server = Mock()
+    server.cfg.is_ssl = False
+
+    with patch('comms_api.core.worker._ssl_context', None):
+        load_ssl_context(server)
+        assert worker_module._ssl_context is None
+
+    server.cfg.ssl_context.assert_not_called()
@@ -0,0 +1,78 @@
+import ssl
+from typing import Optional
+
+from gunicorn.glogging import Logger
+from uvicorn.config import create_ssl_context
+from uvicorn.workers import UvicornWorker
+
+# Server SSL context created by the arbiter and inherited by all the workers
+_ssl_context: Optional[ssl.SSLContext] = None
+
+
+class CommsAPILogger(Logger):
+    """Gunicorn logger that keeps the handlers installed by the comms API logging configuration.
+
+    The comms API configures the gunicorn loggers itself, so the handlers gunicorn adds for its error and
+    access logs are removed instead of duplicating every message.
+    """
+    def setup(self, cfg) -> None:
+        """Set up the gunicorn loggers and remove the handlers added by gunicorn.
+
+        Parameters
+        ----------
+        cfg : gunicorn.config.Config
+            Gunicorn configuration.
+        """
+        super().setup(cfg)
+
+        for log in (self.error_log, self.access_log):
+            handler = self._get_gunicorn_handler(log)
+            if handler is not None:
+                log.removeHandler(handler)
+
+
+class CommsAPIWorker(UvicornWorker):
+    """Uvicorn worker that always uses the uvloop event loop and the httptools HTTP parser."""
+    CONFIG_KWARGS = {**UvicornWorker.CONFIG_KWARGS, 'loop': 'uvloop', 'http': 'httptools'}
+
+    def run(self) -> None:
+        """Load the server configuration using the SSL context created by the arbiter, which applies the gunicorn
+        `ssl_context` hook ignored by the uvicorn worker otherwise, and run the server."""
+        self.config.app = self.wsgi
+        self.config.load()
+
+        if self.config.ssl is not None and _ssl_context is not None:
+            self.config.ssl = _ssl_context
+
+        return super().run()
+
+
+def load_ssl_context(server) -> None:
+    """Gunicorn `when_ready` hook that creates the server SSL context in the arbiter, before the workers are forked.
+
+    The forked workers share the context session ticket keys, so the agents can resume their TLS sessions with
+    tickets on any worker. The session ID cache is still kept by each worker.
+
+    Parameters
+    ----------
+    server : gunicorn.arbiter.Arbiter
+        Gunicorn arbiter.
+    """
+    global _ssl_context
+
+    cfg = server.cfg
+    if not cfg.is_ssl:
+        return
+
+    def default_ssl_context_factory() -> ssl.SSLContext:
+        return create_ssl_context(
+            certfile=cfg.ssl_options.get('certfile'),
+            keyfile=cfg.ssl_options.get('keyfile'),
+            password=cfg.ssl_options.get('password'),
+            ssl_version=cfg.ssl_options.get('ssl_version'),
+            cert_reqs=cfg.ssl_options.get('cert_reqs'),
+            ca_certs=cfg.ssl_options.get('ca_certs'),
+            ciphers=cfg.ssl_options.get('ciphers'),
+        )
+
+    _ssl_context = cfg.ssl_context(cfg, default_ssl_context_factory)
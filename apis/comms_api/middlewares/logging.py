@@ -2,23 +2,42 @@ import contextlib
 import json
 import logging
 import time
+from typing import FrozenSet, Iterable
 
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import Response
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.middlewares import secure_headers
 
 logger = logging.getLogger('wazuh-comms-api')
 
+# Log types of the request messages, the ones handled by the installed log handlers
+_request_log_types: FrozenSet[str] = frozenset({'log', 'json'})
+
+
+def set_request_log_types(log_types: Iterable[str]) -> None:
+    """Set the log types of the messages generated for each request, so the ones that would be discarded by
+    all the log handlers are not generated.
+
+    Parameters
+    ----------
+    log_types : Iterable[str]
+        Log types to generate. Can be 'log' and 'json'.
+    """
+    global _request_log_types
+    _request_log_types = frozenset(log_types)
+
 
-async def log_request(request: Request, response: Response, start_time: time) -> None:
+async def log_request(request: Request, status_code: int, start_time: time) -> None:
     """Generates a log message from a request.
 
     Parameters
     ----------
     request : Request
         HTTP request received.
-    response : Response
-        HTTP response created.
+    status_code : int
+        HTTP response status code.
     start_time : time
         Time at the start of the request.
     """
@@ -28,57 +47,93 @@ async def log_request(request: Request, response: Response, start_time: time) ->
     method = getattr(request, 'method', '')
     query = dict(getattr(request, 'query_params', {}))
     body = await request.json() if hasattr(request, '_json') else {}
-    status_code = response.status_code
 
     if 'key' in body and '/authentication' in path:
         body['key'] = '***'
 
-    log_info = f'({agent_uuid}) ' if agent_uuid is not None else ''
-    log_info += f'"{method} {path}" with parameters {json.dumps(query)} and body '
-    log_info += f'{json.dumps(body)} done in {elapsed_time:.3f}s: {status_code}'
-    json_info = {
-        'http_method': method,
-        'uri': f'{method} {path}',
-        'parameters': query,
-        'body': body,
-        'time': f'{elapsed_time:.3f}s',
-        'status_code': status_code
-    }
-    if agent_uuid is not None:
-        json_info['agent_uuid'] = agent_uuid
+    if 'log' in _request_log_types:
+        log_info = f'({agent_uuid}) ' if agent_uuid is not None else ''
+        log_info += f'"{method} {path}" with parameters {json.dumps(query)} and body '
+        log_info += f'{json.dumps(body)} done in {elapsed_time:.3f}s: {status_code}'
+        logger.info(log_info, extra={'log_type': 'log'})
+
+    if 'json' in _request_log_types:
+        json_info = {
+            'http_method': method,
+            'uri': f'{method} {path}',
+            'parameters': query,
+            'body': body,
+            'time': f'{elapsed_time:.3f}s',
+            'status_code': status_code
+        }
+        if agent_uuid is not None:
+            json_info['agent_uuid'] = agent_uuid
+
+        logger.info(json_info, extra={'log_type': 'json'})
 
-    logger.info(log_info, extra={'log_type': 'log'})
-    logger.info(json_info, extra={'log_type': 'json'})
 
+class SecureHeadersLoggingMiddleware:
+    """ASGI middleware that adds the secure headers to the responses and logs the requests information.
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log requests information."""
+    Both tasks are done in a single middleware so each request goes through one middleware call instead of two.
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
-        """Logs Communications API requests.
+    Parameters
+    ----------
+    app : ASGIApp
+        Application to call.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.headers = secure_headers.headers()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Call the application adding the secure headers to its response, and log the Communications API request.
 
         Parameters
         ----------
-        request : Request
-            HTTP Request received.
-        call_next :  RequestResponseEndpoint
-            Endpoint callable to be executed.
-
-        Returns
-        -------
-        Response
-            Endpoint response.
+        scope : Scope
+            Connection scope.
+        receive : Receive
+            Callable to receive the ASGI messages.
+        send : Send
+            Callable to send the ASGI messages.
         """
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.time()
 
+        request = Request(scope, receive)
         body = await request.body()
         if body:
             with contextlib.suppress(json.decoder.JSONDecodeError):
-                # Load the request body to the _json field before calling the controller so it's cached before the 
+                # Load the request body to the _json field before calling the controller so it's cached before the
                 # stream is consumed. If there's a json error we skip it so it's handled later.
                 # Related to https://github.com/wazuh/wazuh/issues/24060.
                 _ = await request.json()
 
-        response = await call_next(request)
-        _ = await log_request(request, response, start_time)
-        return response
+        body_received = False
+        status_code = None
+
+        async def receive_cached_body() -> Message:
+            # The body was already consumed, so it is sent again to the application
+            nonlocal body_received
+            if not body_received:
+                body_received = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+
+            return await receive()
+
+        async def send_secure_headers(message: Message) -> None:
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                headers = MutableHeaders(scope=message)
+                for name, value in self.headers.items():
+                    headers[name] = value
+
+            await send(message)
+
+        await self.app(scope, receive_cached_body, send_secure_headers)
+        _ = await log_request(request, status_code, start_time)
@@ -0,0 +1,46 @@
+from typing import FrozenSet
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from api.middlewares import secure_headers
+
+
+class ShortCircuitMiddleware:
+    """ASGI middleware that responds to the cheap routes directly, without going through the rest of the
+    middlewares and the router.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        Application to call for the rest of the requests.
+    paths : FrozenSet[str]
+        Paths of the routes that always respond with an empty successful response.
+    """
+    def __init__(self, app: ASGIApp, paths: FrozenSet[str]):
+        self.app = app
+        self.paths = paths
+        # The secure headers do not change, so they are encoded only once
+        self.headers = [(b'content-length', b'0')] + [
+            (name.lower().encode('latin-1'), value.encode('latin-1'))
+            for name, value in secure_headers.headers().items()
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Respond to the request if its route is one of the short-circuited paths, or call the application
+        otherwise.
+
+        Parameters
+        ----------
+        scope : Scope
+            Connection scope.
+        receive : Receive
+            Callable to receive the ASGI messages.
+        send : Send
+            Callable to send the ASGI messages.
+        """
+        if scope['type'] == 'http' and scope['method'] == 'GET' and scope['path'] in self.paths:
+            await send({'type': 'http.response.start', 'status': 200, 'headers': self.headers})
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+
+        await self.app(scope, receive, send)
@@ -1,12 +1,17 @@
 import json
 from datetime import datetime
-from unittest.mock import AsyncMock, MagicMock, call, patch
+from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
 
 import pytest
 from freezegun import freeze_time
 from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
 
-from comms_api.middlewares.logging import LoggingMiddleware, log_request
+from api.middlewares import secure_headers
+from comms_api.middlewares.logging import SecureHeadersLoggingMiddleware, log_request, set_request_log_types
 
 
 @freeze_time(datetime(1970, 1, 1, 0, 0, 0))
@@ -28,8 +33,6 @@ async def test_log_request():
         'status_code': status_code
     }
 
-    mock_resp = MagicMock()
-    mock_resp.status_code = status_code
     mock_req = MagicMock()
     mock_req.client.host = remote
     mock_req.scope = {'path': path}
@@ -40,7 +43,7 @@ async def test_log_request():
     with patch('api.alogging.logger') as log_info_mock:
         log_info_mock.info = MagicMock()
         log_info_mock.level = 1
-        _ = await log_request(request=mock_req, response=mock_resp, start_time=expected_time)
+        _ = await log_request(request=mock_req, status_code=status_code, start_time=expected_time)
 
         log_info = f'{remote} "{method} {path}" with parameters {json.dumps(query)} and body ' \
                     f'{json.dumps(body)} done in {elapsed_time:.3f}s: {status_code}'
@@ -49,18 +52,44 @@ async def test_log_request():
 
 
 @pytest.mark.asyncio
+@pytest.mark.parametrize('log_types, expected_types', [
+    (['log'], ['log']),
+    (['json'], ['json']),
+    (['log', 'json'], ['log', 'json']),
+])
+async def test_log_request_log_types(log_types, expected_types):
+    """Check that `log_request` only generates the messages of the log types set."""
+    mock_req = MagicMock()
+    mock_req.scope = {'path': '/api/v1/events/stateful'}
+    mock_req.json = AsyncMock(return_value={})
+
+    with patch('comms_api.middlewares.logging._request_log_types'), \
+            patch('comms_api.middlewares.logging.logger') as logger_mock:
+        set_request_log_types(log_types)
+        await log_request(request=mock_req, status_code=200, start_time=0)
+
+    assert [c.kwargs['extra']['log_type'] for c in logger_mock.info.call_args_list] == expected_types
+
+
 @freeze_time(datetime(1970, 1, 1, 0, 0, 0))
-async def test_logging_middleware():
-    """Test logging middleware."""
-    middleware = LoggingMiddleware(Starlette())
+def test_secure_headers_logging_middleware():
+    """Test secure headers and logging middleware."""
     expected_time = datetime(1970, 1, 1, 0, 0, 0).timestamp()
-    body = {}
-    body.update({'test': 'test'})
-    mock_req = AsyncMock()
-    mock_req.json = AsyncMock(return_value=body)
-    mock_resp = MagicMock()
-    call_next_mock = AsyncMock(return_value=mock_resp)
+    body = {'test': 'test'}
+
+    async def endpoint(request: Request) -> JSONResponse:
+        return JSONResponse(await request.json(), status_code=201)
+
+    app = Starlette(routes=[Route('/api/v1/events', endpoint, methods=['POST'])])
+    client = TestClient(SecureHeadersLoggingMiddleware(app))
 
     with patch('comms_api.middlewares.logging.log_request') as mock_log_request:
-        _ = await middleware.dispatch(mock_req, call_next_mock)
-        mock_log_request.assert_called_once_with(mock_req, mock_resp, expected_time)
+        response = client.post('/api/v1/events', json=body)
+
+    assert response.status_code == 201
+    assert response.json() == body
+    for name, value in secure_headers.headers().items():
+        assert response.headers[name] == value
+
+    mock_log_request.assert_called_once_with(ANY, 201, expected_time)
+    assert mock_log_request.call_args[0][0]._json == body
@@ -0,0 +1,33 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from comms_api.middlewares.short_circuit import ShortCircuitMiddleware
+
+
+@pytest.mark.parametrize('path', ['/api/v1', '/api/v1/'])
+def test_short_circuit_middleware(path):
+    """Check that the `ShortCircuitMiddleware` responds to the short-circuited paths without calling the app."""
+    app_mock = AsyncMock()
+    client = TestClient(ShortCircuitMiddleware(app_mock, paths=frozenset({'/api/v1', '/api/v1/'})))
+
+    response = client.get(path, follow_redirects=False)
+
+    app_mock.assert_not_called()
+    assert response.status_code == 200
+    assert response.content == b''
+    assert response.headers['server'] == 'Wazuh'
+    assert response.headers['x-frame-options'] == 'deny'
+
+
+def test_short_circuit_middleware_other_paths():
+    """Check that the `ShortCircuitMiddleware` calls the app for the rest of the requests."""
+    app = FastAPI()
+    app.add_api_route('/api/v1/', lambda: {'route': 'home'}, methods=['POST'])
+    app.add_api_route('/api/v1/test', lambda: {'route': 'test'}, methods=['GET'])
+    client = TestClient(ShortCircuitMiddleware(app, paths=frozenset({'/api/v1/'})))
+
+    assert client.get('/api/v1/test').json() == {'route': 'test'}
+    assert client.post('/api/v1/').json() == {'route': 'home'}
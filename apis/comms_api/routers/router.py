@@ -1,5 +1,4 @@
-from fastapi import APIRouter, Depends, status
-from fastapi.responses import Response
+from fastapi import APIRouter, Depends
 
 from comms_api.authentication.authentication import JWTBearer
 from comms_api.routers.authentication import authentication
@@ -16,7 +15,3 @@ router.add_api_route('/files', get_files, methods=['GET'], dependencies=[Depends
 router.add_api_route('/vulnerability/scan', post_scan_request, methods=['POST'], dependencies=[Depends(JWTBearer())],
                      response_model=None)
 
-
-@router.get('/')
-async def home():
-    return Response(status_code=status.HTTP_200_OK)
@@ -12,10 +12,8 @@ import ssl
 import sys
 import atexit
 from argparse import ArgumentParser, Namespace
-from functools import partial
 from sys import exit
 from typing import Any, Callable, Dict
-from multiprocessing import Process
 from multiprocessing.util import _exit_function
 
 from brotli_asgi import BrotliMiddleware
@@ -27,24 +25,30 @@ from starlette.exceptions import HTTPException as StarletteHTTPException
 from api.alogging import set_logging
 from api.configuration import generate_private_key, generate_self_signed_certificate
 from api.constants import API_SSL_PATH, COMMS_API_LOG_PATH
-from api.middlewares import SecureHeadersMiddleware
 from comms_api.core.batcher import create_batcher_process
 from comms_api.core.commands import CommandsManager
 from comms_api.core.unix_server.server import start_unix_server
-from comms_api.middlewares.logging import LoggingMiddleware
+from comms_api.core.worker import load_ssl_context
+from comms_api.middlewares.logging import SecureHeadersLoggingMiddleware, set_request_log_types
+from comms_api.middlewares.short_circuit import ShortCircuitMiddleware
 from comms_api.routers.exceptions import HTTPError, http_error_handler, validation_exception_handler, \
     exception_handler, starlette_http_exception_handler
 from comms_api.routers.router import router
 from wazuh.core import common, pyDaemonModule, utils
 from wazuh.core.exception import WazuhCommsAPIError
 from wazuh.core.batcher.config import BatcherConfig
-from wazuh.core.batcher.mux_demux import MuxDemuxQueue, MuxDemuxManager
+from wazuh.core.batcher.mux_demux import MuxDemuxQueue
 
 from wazuh.core.config.client import CentralizedConfig
 from wazuh.core.config.models.logging import RotatedLoggingConfig
 from wazuh.core.config.models.comms_api import CommsAPIConfig
 
 MAIN_PROCESS = 'wazuh-comms-apid'
+# Responses smaller than this size, in bytes, are sent uncompressed
+COMPRESSION_MINIMUM_SIZE = 1024
+
+# Resources released by terminate_processes, registered by the main process once they are created
+_resources: Dict[str, Any] = {}
 
 
 def create_app(batcher_queue: MuxDemuxQueue, commands_manager: CommandsManager) -> FastAPI:
@@ -63,9 +67,10 @@ def create_app(batcher_queue: MuxDemuxQueue, commands_manager: CommandsManager)
         FastAPI application instance.
     """
     app = FastAPI()
-    app.add_middleware(SecureHeadersMiddleware)
-    app.add_middleware(BrotliMiddleware)
-    app.add_middleware(LoggingMiddleware)
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MINIMUM_SIZE)
+    app.add_middleware(SecureHeadersLoggingMiddleware)
+    # The home route is answered by the middleware, so it is not part of the router
+    app.add_middleware(ShortCircuitMiddleware, paths=frozenset({router.prefix, f'{router.prefix}/'}))
     app.add_exception_handler(HTTPError, http_error_handler)
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(Exception, exception_handler)
@@ -78,8 +83,13 @@ def create_app(batcher_queue: MuxDemuxQueue, commands_manager: CommandsManager)
     return app
 
 
-def setup_logging(foreground_mode: bool, logging_config: RotatedLoggingConfig) -> dict:
-    """Set up the logging module and returns the configuration used.
+def setup_logging(foreground_mode: bool, logging_config: RotatedLoggingConfig) -> None:
+    """Set up the logging module.
+
+    The handlers are built once in the main process, before the application is preloaded, and are inherited by the
+    gunicorn workers. The configuration is not passed to gunicorn so it is not applied again with
+    `logging.config.dictConfig` when gunicorn sets up its own loggers, which keep these handlers only (see
+    `CommsAPILogger`).
 
     Parameters
     ----------
@@ -87,24 +97,34 @@ def setup_logging(foreground_mode: bool, logging_config: RotatedLoggingConfig) -
         Whether to execute the script in foreground mode or not.
     logging_config :  RotatedLoggingConfig
         Logger configuration.
-
-    Returns
-    -------
-    dict
-        Logging configuration dictionary.
     """
     log_config_dict = set_logging(log_filepath=COMMS_API_LOG_PATH,
                                   logging_config=logging_config,
                                   foreground_mode=foreground_mode)
 
+    uid, gid = common.wazuh_uid(), common.wazuh_gid()
     for handler in log_config_dict['handlers'].values():
         if 'filename' in handler:
-            utils.assign_wazuh_ownership(handler['filename'])
-            os.chmod(handler['filename'], 0o660)
-
+            # Resolve the path once and update the file ownership and permissions through its descriptor
+            fd = os.open(handler['filename'], os.O_RDONLY | os.O_CREAT | os.O_NOFOLLOW, 0o660)
+            try:
+                stat = os.fstat(fd)
+                if stat.st_uid != uid or stat.st_gid != gid:
+                    os.fchown(fd, uid, gid)
+                os.fchmod(fd, 0o660)
+            finally:
+                os.close(fd)
+
+    # Same root logger gunicorn used to configure when the logging configuration was passed to it
+    log_config_dict['root'] = {'level': 'INFO', 'handlers': ['console']}
     logging.config.dictConfig(log_config_dict)
 
-    return log_config_dict
+    # Only generate the request messages of the log types handled by the comms API logger handlers
+    log_types = set()
+    for handler in log_config_dict['loggers']['wazuh-comms-api']['handlers']:
+        for log_filter in log_config_dict['handlers'][handler].get('filters', []):
+            log_types.add(log_config_dict['filters'][log_filter]['log_type'])
+    set_request_log_types(log_types)
 
 
 def configure_ssl(keyfile: str, certfile: str) -> None:
@@ -118,12 +138,18 @@ def configure_ssl(keyfile: str, certfile: str) -> None:
         File permissions or path error.
     """
     try:
-        if not os.path.exists(keyfile) or not os.path.exists(certfile):
-            private_key = generate_private_key(keyfile)
-            logger.info(f"Generated private key file in {keyfile}")
-            
-            generate_self_signed_certificate(private_key, certfile)
-            logger.info(f"Generated certificate file in {certfile}")
+        try:
+            os.stat(keyfile)
+            os.stat(certfile)
+            return
+        except FileNotFoundError:
+            pass
+
+        private_key = generate_private_key(keyfile)
+        logger.info(f"Generated private key file in {keyfile}")
+
+        generate_self_signed_certificate(private_key, certfile)
+        logger.info(f"Generated certificate file in {certfile}")
     except ssl.SSLError as exc:
         raise WazuhCommsAPIError(2700, extra_message=str(exc))
     except IOError as exc:
@@ -136,7 +162,11 @@ def configure_ssl(keyfile: str, certfile: str) -> None:
 
 
 def ssl_context(conf, default_ssl_context_factory) -> ssl.SSLContext:
-    """Return the default SSL context with a custom minimum version.
+    """Return the default SSL context with TLS 1.2 as the minimum version.
+
+    The context is created once by the arbiter (see `comms_api.core.worker.load_ssl_context`), so all the workers
+    share its session ticket keys and the agents can resume their sessions on any worker. Only HTTP/1.1 is
+    advertised via ALPN, as it is the only protocol served by the workers.
 
     Returns
     -------
@@ -144,7 +174,8 @@ def ssl_context(conf, default_ssl_context_factory) -> ssl.SSLContext:
         Server SSL context.
     """
     context = default_ssl_context_factory()
-    context.minimum_version = ssl.TLSVersion.MINIMUM_SUPPORTED
+    context.minimum_version = ssl.TLSVersion.TLSv1_2
+    context.set_alpn_protocols(['http/1.1'])
     return context
 
 
@@ -153,7 +184,7 @@ def post_worker_init(worker):
     atexit.unregister(_exit_function)
 
 
-def get_gunicorn_options(pid: int, foreground_mode: bool, log_config_dict: dict, config: CommsAPIConfig) -> dict:
+def get_gunicorn_options(pid: int, foreground_mode: bool, config: CommsAPIConfig) -> dict:
     """Get the gunicorn app configuration options.
 
     Parameters
@@ -162,8 +193,6 @@ def get_gunicorn_options(pid: int, foreground_mode: bool, log_config_dict: dict,
         Main process ID.
     foreground_mode : bool
         Whether to execute the script in foreground mode or not.
-    log_config_dict : dict
-        Logging configuration dictionary.
     config : CommsAPIConfig
         Comms API configuration object.
 
@@ -175,24 +204,26 @@ def get_gunicorn_options(pid: int, foreground_mode: bool, log_config_dict: dict,
 
     configure_ssl(config.ssl.key, config.ssl.cert)
 
-    pidfile = common.WAZUH_RUN / f'{MAIN_PROCESS}-{pid}.pid'
+    pidfile = str(common.WAZUH_RUN / f'{MAIN_PROCESS}-{pid}.pid')
 
     return {
         'proc_name': MAIN_PROCESS,
-        'pidfile': str(pidfile),
+        'pidfile': pidfile,
         'daemon': not foreground_mode,
         'bind': f'{config.host}:{config.port}',
         'workers': config.workers,
-        'worker_class': 'uvicorn.workers.UvicornWorker',
+        'worker_class': 'comms_api.core.worker.CommsAPIWorker',
+        'logger_class': 'comms_api.core.worker.CommsAPILogger',
         'preload_app': True,
         'keyfile': config.ssl.key,
         'certfile': config.ssl.cert,
         'ca_certs': config.ssl.ca,
         'ssl_context': ssl_context,
         'ciphers': config.ssl.ssl_ciphers,
-        'logconfig_dict': log_config_dict,
+        # Not cached at import time, the main process may drop its privileges after it
         'user': os.getuid(),
         'post_worker_init': post_worker_init,
+        'when_ready': load_ssl_context,
         'timeout': 300,
     }
 
@@ -233,14 +264,7 @@ class StandaloneApplication(BaseApplication):
         return self.app
 
 
-def signal_handler(
-    signum: int,
-    frame: Any,
-    parent_pid: int,
-    mux_demux_manager: MuxDemuxManager,
-    batcher_process: Process,
-    commands_manager: CommandsManager
-) -> None:
+def signal_handler(signum: int, frame: Any) -> None:
     """Handle incoming signals to gracefully shutdown the API.
 
     Parameters
@@ -249,43 +273,22 @@ def signal_handler(
         The signal number received.
     frame : Any
         The current stack frame (unused).
-    parent_pid : int
-        The parent process ID used to verify if the termination should proceed.
-    mux_demux_manager : MuxDemuxManager
-        The MuxDemux manager instance to be shut down.
-    batcher_process : Process
-        The batcher process to be terminated.
-    commands_manager : CommandsManager
-        Commands manager.
     """
     logger.info(f"Received signal {signal.Signals(signum).name}, shutting down")
-    terminate_processes(parent_pid, mux_demux_manager, batcher_process, commands_manager)
+    terminate_processes()
 
 
-def terminate_processes(
-    parent_pid: int, mux_demux_manager: MuxDemuxManager, batcher_process: Process, commands_manager: CommandsManager
-) -> None:
-    """Terminate all related resources, and delete child and main processes 
+def terminate_processes() -> None:
+    """Terminate all the registered resources, and delete child and main processes
     if the current process ID matches the parent process ID.
-
-    Parameters
-    ----------
-    parent_pid : int
-        The parent process ID used to verify if the termination should proceed.
-    mux_demux_manager : MuxDemuxManager
-        The MuxDemux manager instance to be shut down.
-    batcher_process : Process
-        The batcher process to be terminated.
-    commands_manager : CommandsManager
-        Commands manager.
     """
-    if parent_pid == os.getpid():
+    if _resources.get('parent_pid') == os.getpid():
         logger.info('Shutting down')
-        batcher_process.terminate()
-        mux_demux_manager.shutdown()
-        commands_manager.shutdown()
-        pyDaemonModule.delete_child_pids(MAIN_PROCESS, pid, logger)
-        pyDaemonModule.delete_pid(MAIN_PROCESS, pid)
+        _resources['batcher_process'].terminate()
+        _resources['mux_demux_manager'].shutdown()
+        _resources['commands_manager'].shutdown()
+        pyDaemonModule.delete_child_pids(MAIN_PROCESS, _resources['parent_pid'], logger)
+        pyDaemonModule.delete_pid(MAIN_PROCESS, _resources['parent_pid'])
 
 
 if __name__ == '__main__':
@@ -303,7 +306,7 @@ if __name__ == '__main__':
 
     utils.clean_pid_files(MAIN_PROCESS)
     
-    log_config_dict = setup_logging(args.foreground, comms_api_config.logging)
+    setup_logging(args.foreground, comms_api_config.logging)
     logger = logging.getLogger('wazuh-comms-api')
 
     if args.foreground:
@@ -330,20 +333,18 @@ if __name__ == '__main__':
     start_unix_server(commands_manager)
 
     pid = os.getpid()
-    signal.signal(
-        signal.SIGTERM,
-        partial(
-            signal_handler, parent_pid=pid, mux_demux_manager=mux_demux_manager, batcher_process=batcher_process,
-            commands_manager=commands_manager
-        )
+    _resources.update(
+        parent_pid=pid, mux_demux_manager=mux_demux_manager, batcher_process=batcher_process,
+        commands_manager=commands_manager
     )
+    signal.signal(signal.SIGTERM, signal_handler)
     signal.signal(signal.SIGINT, signal.SIG_IGN)
 
     logger.info(f'Listening on {args.host}:{args.port}')
     
     try:
         app = create_app(mux_demux_manager.get_queue(), commands_manager)
-        options = get_gunicorn_options(pid, args.foreground, log_config_dict, comms_api_config)
+        options = get_gunicorn_options(pid, args.foreground, comms_api_config)
         StandaloneApplication(app, options).run()
     except WazuhCommsAPIError as e:
         logger.error(f'Error when trying to start the Wazuh Communications API. {e}')
@@ -352,4 +353,4 @@ if __name__ == '__main__':
         logger.error(f'Internal error when trying to start the Wazuh Communications API. {e}')
         exit(1)
     finally:
-        terminate_processes(pid, mux_demux_manager, batcher_process, commands_manager)
+        terminate_processes()
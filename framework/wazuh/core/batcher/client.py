@@ -1,25 +1,299 @@
 import asyncio
-from typing import Optional
+import contextlib
+import functools
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
 
 from wazuh.core.batcher.mux_demux import MuxDemuxQueue, Item
 from wazuh.core.indexer.models.events import AgentMetadata, Header, StatefulEvent, get_module_index_name
 
+logger = logging.getLogger('wazuh-comms-api')
+
+RESPONSE_WAIT_TIMEOUT = 1
+SUBMISSION_MAX_BATCH = 100
+SUBMISSION_TIMEOUT = 0.001
+SUBMISSION_PUT_TIMEOUT = 0.1
+
+_response_notifier: Optional['ResponseNotifier'] = None
+_submission_dispatcher: Optional['SubmissionDispatcher'] = None
+
+
+class ResponseNotifier(threading.Thread):
+    """Daemon thread that waits for the responses of the MuxDemuxQueue and resolves the futures of
+    the clients waiting for them.
+
+    A single blocking call to the queue is kept for all the pending responses of the process, instead
+    of each client checking periodically if its response is available.
+
+    Parameters
+    ----------
+    queue : MuxDemuxQueue
+        MuxDemuxQueue instance used to route items.
+    timeout : float
+        Maximum time, in seconds, that each call to the queue blocks waiting for responses.
+    """
+    def __init__(self, queue: MuxDemuxQueue, timeout: float = RESPONSE_WAIT_TIMEOUT):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.timeout = timeout
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+
+    def register_waiter(self, item_id: int) -> asyncio.Future:
+        """Create a future that is resolved when the response for the given unique identifier is available.
+        The waiter is removed as soon as the future is done, including when it is cancelled.
+
+        Parameters
+        ----------
+        item_id : int
+            Unique identifier for the response.
+
+        Returns
+        -------
+        asyncio.Future
+            Future resolved with the indexer response.
+        """
+        future = asyncio.get_running_loop().create_future()
+        with self._lock:
+            self._waiters[item_id] = future
+            self._pending.set()
+
+        future.add_done_callback(functools.partial(self._remove_waiter, item_id))
+        return future
+
+    def _remove_waiter(self, item_id: int, future: asyncio.Future):
+        """Remove the waiter of the given unique identifier unless it was replaced by a newer one.
+
+        Parameters
+        ----------
+        item_id : int
+            Unique identifier for the response.
+        future : asyncio.Future
+            Future of the waiter to remove.
+        """
+        with self._lock:
+            if self._waiters.get(item_id) is future:
+                del self._waiters[item_id]
+
+    def run(self):
+        """Wait for the responses of the registered futures and resolve them in their event loop."""
+        version = None
+        while True:
+            self._pending.wait()
+            with self._lock:
+                item_ids = list(self._waiters)
+                if not item_ids:
+                    self._pending.clear()
+                    continue
+
+            try:
+                version, responses = self.queue.wait_for_responses(item_ids, version, self.timeout)
+            except Exception as e:
+                logger.error(f'Error waiting for batcher responses: {e}', exc_info=True)
+                self._resolve({item_id: e for item_id in item_ids}, exception=True)
+                version = None
+                continue
+
+            self._resolve(responses)
+
+    def _resolve(self, results: dict, exception: bool = False):
+        """Remove the waiters of the given unique identifiers and set their futures results.
+
+        Parameters
+        ----------
+        results : dict
+            Indexer responses, or exceptions, by unique identifier.
+        exception : bool
+            Whether to set the values as the futures exception instead of their result.
+        """
+        for item_id, result in results.items():
+            with self._lock:
+                future = self._waiters.pop(item_id, None)
+
+            if future is None:
+                continue
+
+            with contextlib.suppress(RuntimeError):
+                # The event loop of the future may be already closed
+                future.get_loop().call_soon_threadsafe(_set_future_result, future, result, exception)
+
+
+def _set_future_result(future: asyncio.Future, result: Any, exception: bool):
+    """Set the future result or exception unless it was already cancelled.
+
+    Parameters
+    ----------
+    future : asyncio.Future
+        Future to resolve.
+    result : Any
+        Result or exception to set.
+    exception : bool
+        Whether the result is an exception.
+    """
+    if future.done():
+        return
+
+    if exception:
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+
+def get_response_notifier(queue: MuxDemuxQueue) -> ResponseNotifier:
+    """Return the response notifier of the current process, starting it if it is not running.
+
+    Parameters
+    ----------
+    queue : MuxDemuxQueue
+        MuxDemuxQueue instance used to route items.
+
+    Returns
+    -------
+    ResponseNotifier
+        Response notifier thread.
+    """
+    global _response_notifier
+
+    # Threads are not inherited by forked processes, so each worker starts its own notifier
+    if _response_notifier is None or not _response_notifier.is_alive():
+        _response_notifier = ResponseNotifier(queue)
+        _response_notifier.start()
+
+    return _response_notifier
+
+
+class SubmissionDispatcher:
+    """Task that sends the items submitted by all the clients of the event loop to the MuxDemuxQueue.
+
+    The items submitted by concurrent requests are sent together, up to `max_batch` items per call to the queue,
+    instead of each client sending its own items.
+
+    Parameters
+    ----------
+    queue : MuxDemuxQueue
+        MuxDemuxQueue instance used to route items.
+    max_batch : int
+        Maximum number of items to send in a single call. Defaults to 100.
+    timeout : float
+        Time, in seconds, to wait for more items before sending an incomplete batch. Defaults to 0.001.
+    put_timeout : float
+        Maximum time, in seconds, to wait for free space in the queue before failing a batch. Defaults to 0.1.
+    """
+    def __init__(self, queue: MuxDemuxQueue, max_batch: int = SUBMISSION_MAX_BATCH,
+                 timeout: float = SUBMISSION_TIMEOUT, put_timeout: float = SUBMISSION_PUT_TIMEOUT):
+        self.queue = queue
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self.put_timeout = put_timeout
+        self._items: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the dispatcher task in the running event loop."""
+        self._task = asyncio.get_running_loop().create_task(self.run())
+
+    def is_running(self) -> bool:
+        """Check whether the dispatcher task is running in the current event loop.
+
+        Returns
+        -------
+        bool
+            True if the task is running in the current event loop, False otherwise.
+        """
+        return self._task is not None and not self._task.done() and \
+            self._task.get_loop() is asyncio.get_running_loop()
+
+    def submit(self, item: Item) -> asyncio.Future:
+        """Queue an item to be sent to the mux queue.
+
+        Parameters
+        ----------
+        item : Item
+            Item to send.
+
+        Returns
+        -------
+        asyncio.Future
+            Future resolved once the item is sent, or with the error found sending it.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._items.put_nowait((item, future))
+        return future
+
+    async def run(self):
+        """Send the submitted items to the mux queue in batches."""
+        while True:
+            batch = [await self._items.get()]
+            if self._items.qsize() < self.max_batch - 1:
+                # Give the rest of the requests the chance to submit their items
+                await asyncio.sleep(self.timeout)
+
+            while len(batch) < self.max_batch and not self._items.empty():
+                batch.append(self._items.get_nowait())
+
+            await self._send(batch)
+
+    async def _send(self, batch: List[Tuple[Item, asyncio.Future]]):
+        """Send a batch of items to the mux queue in a single call and resolve their futures.
+
+        The call waits for free space in the queue in the default executor, so the event loop keeps serving the
+        requests. If the queue is still full after `put_timeout` seconds, the futures fail with a queue.Full error.
+
+        Parameters
+        ----------
+        batch : List[Tuple[Item, asyncio.Future]]
+            Items to send and their futures.
+        """
+        send = functools.partial(self.queue.send_many_to_mux, [item for item, _ in batch], timeout=self.put_timeout)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, send)
+        except Exception as e:
+            logger.error(f'Error sending items to the batcher: {str(e) or type(e).__name__}')
+            for _, future in batch:
+                _set_future_result(future, e, exception=True)
+        else:
+            for _, future in batch:
+                _set_future_result(future, None, exception=False)
+
+
+def get_submission_dispatcher(queue: MuxDemuxQueue) -> SubmissionDispatcher:
+    """Return the submission dispatcher of the current event loop, starting it if it is not running.
+
+    Parameters
+    ----------
+    queue : MuxDemuxQueue
+        MuxDemuxQueue instance used to route items.
+
+    Returns
+    -------
+    SubmissionDispatcher
+        Submission dispatcher.
+    """
+    global _submission_dispatcher
+
+    if _submission_dispatcher is None or not _submission_dispatcher.is_running():
+        _submission_dispatcher = SubmissionDispatcher(queue)
+        _submission_dispatcher.start()
+
+    return _submission_dispatcher
+
 
 class BatcherClient:
     """Client class to send and receive events via a MuxDemuxQueue.
 
+    The items are submitted to the dispatcher of the event loop, which sends the items of all the clients
+    together, so each item does not require a separate call to the queue.
+
     Parameters
     ----------
     queue : MuxDemuxQueue
         MuxDemuxQueue instance used to route items.
-    wait_frequency: float
-        The frequency, in seconds, at which the client checks for responses in the queue.
-        Defaults to 0.1 seconds.
-
     """
-    def __init__(self, queue: MuxDemuxQueue, wait_frequency: float = 0.1):
+    def __init__(self, queue: MuxDemuxQueue):
         self.queue = queue
-        self.wait_frequency = wait_frequency
+        self._sent: Dict[str, asyncio.Future] = {}
 
     def send_operation(self, agent_metadata: AgentMetadata, header: Header, event: StatefulEvent = None):
         """Send an event operation through the RouterQueue.
@@ -33,14 +307,18 @@ class BatcherClient:
         event : StatefulEvent
             Event data.
         """
-        content = agent_metadata.model_dump() | event.data.model_dump(exclude_none=True) if event else None
+        content = None
+        if event:
+            content = agent_metadata.cached_dump()
+            content.update(event.data.model_dump(exclude_none=True))
+
         item = Item(
             id=header.id,
             operation=header.operation,
             content=content,
             index_name=get_module_index_name(header.module, header.type)
         )
-        self.queue.send_to_mux(item)
+        self._sent[item.id] = get_submission_dispatcher(self.queue).submit(item)
 
     async def get_response(self, item_id: int) -> Optional[dict]:
         """Asynchronously wait for a response to become available and retrieve it.
@@ -50,13 +328,19 @@ class BatcherClient:
         item_id : int
             Unique identifier for the response.
 
+        Raises
+        ------
+        Exception
+            If the item could not be sent to the batcher.
+
         Returns
         -------
         Optional[dict]
             Indexer response if available, None otherwise.
         """
-        while True:
-            if not self.queue.is_response_pending(item_id):
-                return self.queue.receive_from_demux(item_id)
-            else:
-                await asyncio.sleep(self.wait_frequency)
+        sent = self._sent.pop(item_id, None)
+        if sent is not None:
+            await sent
+
+        future = get_response_notifier(self.queue).register_waiter(item_id)
+        return await future
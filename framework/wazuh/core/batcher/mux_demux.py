@@ -1,13 +1,21 @@
 import os
 import logging
+import queue
 import signal
-from multiprocessing import Queue, Process, Event
-from multiprocessing.managers import DictProxy, SyncManager
-from typing import Any
+import threading
+from multiprocessing import Process, Event
+from multiprocessing.managers import SyncManager
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from wazuh.core.batcher.ring import RING_SIZE, SharedMemoryRing
 
 
 logger = logging.getLogger('wazuh-comms-api')
 
+DEMUX_READ_TIMEOUT = 1
+
 
 class Item:
     """Item for the MuxDemuxQueue with an associated unique identifier.
@@ -29,21 +37,152 @@ class Item:
         self.operation = operation
         self.index_name = index_name
 
+    def to_bytes(self) -> bytes:
+        """Serialize the item to JSON.
+
+        Returns
+        -------
+        bytes
+            Serialized item.
+        """
+        return orjson.dumps(self.__dict__)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'Item':
+        """Deserialize an item from JSON.
+
+        Parameters
+        ----------
+        data : bytes
+            Serialized item.
+
+        Returns
+        -------
+        Item
+            Deserialized item.
+        """
+        return cls(**orjson.loads(data))
+
+
+class ResponseStore:
+    """Store of the indexer responses, shared between processes through a SyncManager.
+
+    Clients may wait until the responses they are interested in are stored.
+    """
+    def __init__(self):
+        self._responses: Dict[int, dict] = {}
+        self._condition = threading.Condition()
+        self._version = 0
+
+    def add(self, item_id: int, response: dict):
+        """Store a response and wake up the clients waiting for responses.
+
+        Parameters
+        ----------
+        item_id : int
+            Unique identifier of the response.
+        response : dict
+            Indexer response.
+        """
+        with self._condition:
+            self._responses[item_id] = response
+            self._version += 1
+            self._condition.notify_all()
+
+    def contains(self, item_id: int) -> bool:
+        """Check if a response is stored for a given unique identifier.
+
+        Parameters
+        ----------
+        item_id : int
+            Unique identifier to check.
+
+        Returns
+        -------
+        bool
+            True if the response is stored, False otherwise.
+        """
+        return item_id in self._responses
+
+    def pop(self, item_id: int) -> dict:
+        """Retrieve and remove the response of a given unique identifier.
+
+        Parameters
+        ----------
+        item_id : int
+            Unique identifier of the response.
+
+        Returns
+        -------
+        dict
+            Indexer response.
+        """
+        with self._condition:
+            return self._responses.pop(item_id)
+
+    def wait_for(
+        self, item_ids: List[int], last_version: Optional[int] = None, timeout: float = None
+    ) -> Tuple[int, Dict[int, dict]]:
+        """Wait until any of the given responses is stored, retrieve and remove the available ones.
+
+        The call returns immediately if a response was stored after `last_version`, so the caller can
+        refresh the identifiers it waits for without missing any notification.
+
+        Parameters
+        ----------
+        item_ids : List[int]
+            Unique identifiers of the responses to wait for.
+        last_version : Optional[int]
+            Responses version returned by the previous call. Defaults to None.
+        timeout : float
+            Maximum time, in seconds, to wait for a response. Defaults to None (no timeout).
+
+        Returns
+        -------
+        Tuple[int, Dict[int, dict]]
+            Current responses version and the indexer responses found, by unique identifier.
+        """
+        with self._condition:
+            responses = self._pop_many(item_ids)
+            if not responses and last_version == self._version:
+                self._condition.wait(timeout)
+                responses = self._pop_many(item_ids)
+
+            return self._version, responses
+
+    def _pop_many(self, item_ids: List[int]) -> Dict[int, dict]:
+        """Retrieve and remove the stored responses for the given unique identifiers.
+
+        Parameters
+        ----------
+        item_ids : List[int]
+            Unique identifiers of the responses.
+
+        Returns
+        -------
+        Dict[int, dict]
+            Indexer responses found, by unique identifier.
+        """
+        return {item_id: self._responses.pop(item_id) for item_id in item_ids if item_id in self._responses}
+
 
 class MuxDemuxQueue:
     """Class for managing items between mux and demux components.
 
+    Items are serialized and exchanged through shared memory rings, so only the responses store
+    is accessed through the SyncManager.
+
     Parameters
     ----------
-    proxy_dict : DictProxy
-        Dictionary-like proxy for managing responses.
-    mux_queue : Queue
-        Queue for multiplexing items.
-    demux_queue : Queue
-        Queue for demultiplexing items.
+    responses : ResponseStore
+        Store, or proxy to the store, for managing responses.
+    mux_queue : SharedMemoryRing
+        Ring for multiplexing items.
+    demux_queue : SharedMemoryRing
+        Ring for demultiplexing items.
     """
-    def __init__(self, proxy_dict: DictProxy, mux_queue: Queue, demux_queue: Queue):
-        self.responses = proxy_dict
+    def __init__(self, responses: ResponseStore, mux_queue: SharedMemoryRing, demux_queue: SharedMemoryRing):
+        self.responses = responses
         self.mux_queue = mux_queue
         self.demux_queue = demux_queue
 
@@ -55,7 +194,22 @@ class MuxDemuxQueue:
         item : Item
             Item to be put into the mux queue.
         """
-        self.mux_queue.put(item)
+        self.mux_queue.put(item.to_bytes())
+
+    def send_many_to_mux(self, items: List[Item], block: bool = True, timeout: Optional[float] = None):
+        """Put several items into the mux queue at once. If the queue is full and block is False, or the
+        timeout expires, none of the items is put and it raises a queue.Full error.
+
+        Parameters
+        ----------
+        items : List[Item]
+            Items to be put into the mux queue.
+        block : bool
+            Whether to wait for free space in the queue. Defaults to True.
+        timeout : Optional[float]
+            Maximum time, in seconds, to wait for free space. Defaults to None (no timeout).
+        """
+        self.mux_queue.put_many([item.to_bytes() for item in items], block=block, timeout=timeout)
 
     def receive_from_mux(self, block: bool = True) -> Item:
         """Retrieve a item from the mux queue. If the queue
@@ -66,7 +220,7 @@ class MuxDemuxQueue:
         Item
             Item retrieved from the mux queue.
         """
-        return self.mux_queue.get(block=block)
+        return Item.from_bytes(self.mux_queue.get(block=block))
 
     def send_to_demux(self, item: Item):
         """Put a item into the demux queue.
@@ -76,59 +230,53 @@ class MuxDemuxQueue:
         item : Item
             Item to be put into the demux queue.
         """
-        self.demux_queue.put(item)
+        self.demux_queue.put(item.to_bytes())
 
-    def is_response_pending(self, item_id: int) -> bool:
-        """Check if a response is available for a given unique identifier.
+    def wait_for_responses(
+        self, item_ids: List[int], last_version: Optional[int] = None, timeout: float = None
+    ) -> Tuple[int, Dict[int, dict]]:
+        """Wait until any of the given responses is stored, retrieve and remove the available ones.
 
         Parameters
         ----------
-        item_id : int
-            Unique identifier to check.
+        item_ids : List[int]
+            Unique identifiers of the responses to wait for.
+        last_version : Optional[int]
+            Responses version returned by the previous call. Defaults to None.
+        timeout : float
+            Maximum time, in seconds, to wait for a response. Defaults to None (no timeout).
 
         Returns
         -------
-        bool
-            True if response is available, False otherwise.
+        Tuple[int, Dict[int, dict]]
+            Current responses version and the indexer responses found, by unique identifier.
         """
-        return item_id not in self.responses
+        return self.responses.wait_for(item_ids, last_version, timeout)
 
-    def receive_from_demux(self, item_id: int) -> dict:
-        """Retrieve and remove a response from the dictionary for a given unique identifier.
+    def internal_get_response_from_demux(self, timeout: Optional[float] = None) -> Item:
+        """Retrieve an item from the demux queue. If the timeout expires it raises a queue.Empty error.
 
         Parameters
         ----------
-        item_id : int
-            Unique identifier of the response.
-
-        Returns
-        -------
-        dict
-            Indexer response.
-        """
-        response = self.responses[item_id]
-        del self.responses[item_id]
-        return response
-
-    def internal_get_response_from_demux(self) -> Item:
-        """Retrieve an item from the demux queue.
+        timeout : Optional[float]
+            Maximum time, in seconds, to wait for an item. Defaults to None (no timeout).
 
         Returns
         -------
         Item
             Item retrieved from the demux queue.
         """
-        return self.demux_queue.get()
+        return Item.from_bytes(self.demux_queue.get(timeout=timeout))
 
     def internal_store_response(self, item: Item):
-        """Update the responses dictionary with the item content.
+        """Update the responses dictionary with the item content and wake up the clients waiting for responses.
 
         Parameters
         ----------
         item : Item
             Item whose content will be added to the response dictionary.
         """
-        self.responses[item.id] = item.content
+        self.responses.add(item.id, item.content)
 
 
 class MuxDemuxRunner(Process):
@@ -173,9 +321,11 @@ class MuxDemuxRunner(Process):
 
         while not self._shutdown_event.is_set():
             try:
-                item = self.queue.internal_get_response_from_demux()
+                item = self.queue.internal_get_response_from_demux(timeout=DEMUX_READ_TIMEOUT)
                 if isinstance(item, Item):
                     self.queue.internal_store_response(item)
+            except queue.Empty:
+                continue
             except Exception as e:
                 if self._shutdown_event.is_set():
                     return
@@ -188,16 +338,22 @@ class MuxDemuxManager:
 
     The MuxDemuxManager handles the creation, management, and shutdown of the MuxDemuxQueue
     and its associated process.
+
+    Parameters
+    ----------
+    ring_size : int
+        Size, in bytes, of each of the mux and demux rings. Both rings are allocated in /dev/shm.
+        Defaults to 4 MiB.
     """
-    def __init__(self):
-        SyncManager.register('MuxDemuxQueue', MuxDemuxQueue)
+    def __init__(self, ring_size: int = RING_SIZE):
+        SyncManager.register('ResponseStore', ResponseStore)
         self.manager = SyncManager()
         self.manager.start()
 
-        self.queue = self.manager.MuxDemuxQueue(
-            self.manager.dict(),
-            self.manager.Queue(),
-            self.manager.Queue()
+        self.queue = MuxDemuxQueue(
+            self.manager.ResponseStore(),
+            SharedMemoryRing(ring_size),
+            SharedMemoryRing(ring_size)
         )
         self.queue_process = MuxDemuxRunner(queue=self.queue)
         self.queue_process.start()
@@ -233,6 +389,8 @@ class MuxDemuxManager:
         return self.queue
 
     def shutdown(self):
-        """Terminate the MuxDemuxQueue process and shuts down the SyncManager."""
+        """Terminate the MuxDemuxQueue process, shuts down the SyncManager and releases the shared memory rings."""
         self.queue_process.terminate()
         self.manager.shutdown()
+        self.queue.mux_queue.close()
+        self.queue.demux_queue.close()
@@ -0,0 +1,216 @@
+import os
+import queue
+import struct
+import time
+from multiprocessing import Condition, Lock
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Optional
+
+# Total number of bytes written (head) and read (tail) since the ring creation
+INDICES = struct.Struct('QQ')
+# Length prefix of each record
+RECORD_LENGTH = struct.Struct('I')
+
+# The batches are a few KB, so the default ring holds thousands of pending items
+RING_SIZE = 4 * 1024 * 1024
+
+
+class SharedMemoryRing:
+    """Byte records ring buffer allocated in shared memory.
+
+    The ring must be created before forking the processes that use it, so they inherit the shared memory
+    segment and the synchronization primitives. Putting or getting a record only copies it into or out of the
+    shared memory and updates the head or tail index, instead of sending it through a manager process.
+
+    The segment takes the ring size plus a 16 bytes header from /dev/shm. It is reserved when the ring is
+    created, so a /dev/shm without enough free space (e.g. the 64 MiB default of a Docker container) raises an
+    OSError here instead of a SIGBUS once the ring is written.
+
+    Parameters
+    ----------
+    size : int
+        Size, in bytes, of the records area.
+    """
+    def __init__(self, size: int = RING_SIZE):
+        self.size = size
+        self._shm = SharedMemory(create=True, size=INDICES.size + size)
+        try:
+            os.posix_fallocate(self._shm._fd, 0, INDICES.size + size)
+        except OSError:
+            self.close()
+            raise
+
+        INDICES.pack_into(self._shm.buf, 0, 0, 0)
+
+        lock = Lock()
+        self._not_empty = Condition(lock)
+        self._not_full = Condition(lock)
+
+    def put(self, data: bytes, block: bool = True, timeout: Optional[float] = None):
+        """Write a record into the ring. If the ring is full and block is False, or the timeout
+        expires, it raises a queue.Full error.
+
+        Parameters
+        ----------
+        data : bytes
+            Record to write.
+        block : bool
+            Whether to wait for free space in the ring. Defaults to True.
+        timeout : Optional[float]
+            Maximum time, in seconds, to wait for free space. Defaults to None (no timeout).
+
+        Raises
+        ------
+        ValueError
+            If the record does not fit in the ring.
+        """
+        self.put_many([data], block=block, timeout=timeout)
+
+    def put_many(self, records: Iterable[bytes], block: bool = True, timeout: Optional[float] = None):
+        """Write several records into the ring acquiring its lock once. The records are written all together
+        or none of them is.
+
+        Parameters
+        ----------
+        records : Iterable[bytes]
+            Records to write.
+        block : bool
+            Whether to wait for the lock and for free space in the ring. Defaults to True.
+        timeout : Optional[float]
+            Maximum time, in seconds, to wait for the lock and for free space for all the records. Defaults to None
+            (no timeout).
+
+        Raises
+        ------
+        ValueError
+            If the records do not fit in the ring.
+        queue.Full
+            If the lock is not acquired or there is no free space in the ring, and block is False or the timeout
+            expires.
+        """
+        records = list(records)
+        length = sum(RECORD_LENGTH.size + len(data) for data in records)
+        if length > self.size:
+            raise ValueError(f'Records of {length} bytes exceed the ring size ({self.size} bytes)')
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._not_full.acquire(block, timeout):
+            raise queue.Full
+
+        try:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not self._not_full.wait_for(lambda: self._free_space() >= length, remaining if block else 0):
+                raise queue.Full
+
+            head, tail = INDICES.unpack_from(self._shm.buf, 0)
+            position = head
+            for data in records:
+                self._write(position, RECORD_LENGTH.pack(len(data)))
+                self._write(position + RECORD_LENGTH.size, data)
+                position += RECORD_LENGTH.size + len(data)
+
+            INDICES.pack_into(self._shm.buf, 0, position, tail)
+            self._not_empty.notify(len(records))
+        finally:
+            self._not_full.release()
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> bytes:
+        """Read and remove the oldest record from the ring. If the lock is not acquired or the ring is empty,
+        and block is False or the timeout expires, it raises a queue.Empty error.
+
+        Parameters
+        ----------
+        block : bool
+            Whether to wait for the lock and for a record. Defaults to True.
+        timeout : Optional[float]
+            Maximum time, in seconds, to wait for the lock and for a record. Defaults to None (no timeout).
+
+        Returns
+        -------
+        bytes
+            Record read from the ring.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._not_empty.acquire(block, timeout):
+            raise queue.Empty
+
+        try:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not self._not_empty.wait_for(lambda: not self.empty(), remaining if block else 0):
+                raise queue.Empty
+
+            head, tail = INDICES.unpack_from(self._shm.buf, 0)
+            length, = RECORD_LENGTH.unpack(self._read(tail, RECORD_LENGTH.size))
+            data = self._read(tail + RECORD_LENGTH.size, length)
+            INDICES.pack_into(self._shm.buf, 0, head, tail + RECORD_LENGTH.size + length)
+            self._not_full.notify_all()
+        finally:
+            self._not_empty.release()
+
+        return data
+
+    def empty(self) -> bool:
+        """Check whether the ring has no records.
+
+        Returns
+        -------
+        bool
+            True if the ring is empty, False otherwise.
+        """
+        head, tail = INDICES.unpack_from(self._shm.buf, 0)
+        return head == tail
+
+    def close(self):
+        """Close the shared memory segment in the current process and release it."""
+        self._shm.close()
+        self._shm.unlink()
+
+    def _free_space(self) -> int:
+        """Return the number of free bytes in the ring.
+
+        Returns
+        -------
+        int
+            Free space in bytes.
+        """
+        head, tail = INDICES.unpack_from(self._shm.buf, 0)
+        return self.size - (head - tail)
+
+    def _write(self, position: int, data: bytes):
+        """Copy data into the records area, wrapping around its end.
+
+        Parameters
+        ----------
+        position : int
+            Absolute position of the data in the ring.
+        data : bytes
+            Data to copy.
+        """
+        start = INDICES.size + position % self.size
+        first = min(len(data), INDICES.size + self.size - start)
+        self._shm.buf[start:start + first] = data[:first]
+        if first < len(data):
+            self._shm.buf[INDICES.size:INDICES.size + len(data) - first] = data[first:]
+
+    def _read(self, position: int, length: int) -> bytes:
+        """Copy data out of the records area, wrapping around its end.
+
+        Parameters
+        ----------
+        position : int
+            Absolute position of the data in the ring.
+        length : int
+            Number of bytes to copy.
+
+        Returns
+        -------
+        bytes
+            Data copied.
+        """
+        start = INDICES.size + position % self.size
+        first = min(length, INDICES.size + self.size - start)
+        data = bytes(self._shm.buf[start:start + first])
+        if first < length:
+            data += bytes(self._shm.buf[INDICES.size:INDICES.size + length - first])
+
+        return data
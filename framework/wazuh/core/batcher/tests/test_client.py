@@ -1,37 +1,177 @@
-from unittest.mock import patch, AsyncMock, call
+import asyncio
+import contextlib
+import queue
+import threading
+from unittest.mock import patch, call, Mock
 
 import pytest
 
-from framework.wazuh.core.batcher.client import BatcherClient
+from framework.wazuh.core.batcher import client
+from framework.wazuh.core.batcher.client import BatcherClient, ResponseNotifier, SubmissionDispatcher, \
+    get_response_notifier, get_submission_dispatcher
+from framework.wazuh.core.batcher.mux_demux import Item
 from wazuh.core.indexer.bulk import Operation
 from wazuh.core.indexer.models.agent import Host, OS
 from wazuh.core.indexer.models.events import Agent, AgentMetadata, SCAEvent, StatefulEvent, Header, Module
 
 
+AGENT_METADATA = AgentMetadata(agent=Agent(
+    id='01929571-49b5-75e8-a3f6-1d2b84f4f71a',
+    name='test',
+    groups=['group1', 'group2'],
+    type='endpoint',
+    version='5.0.0',
+    host=Host(
+        architecture='x86_64',
+        ip='127.0.0.1',
+        os=OS(
+            name='Debian 12',
+            platform='Linux'
+        )
+    ),
+))
+
+
+@pytest.fixture
+async def reset_submission_dispatcher():
+    """Run the test without a submission dispatcher and stop the one started by it."""
+    with patch('framework.wazuh.core.batcher.client._submission_dispatcher', None):
+        yield
+
+        dispatcher = client._submission_dispatcher
+        if dispatcher is not None:
+            dispatcher._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await dispatcher._task
+
+
+@pytest.mark.asyncio
 @patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
-def test_send_event(queue_mock):
+async def test_send_event(queue_mock, reset_submission_dispatcher):
     """Check that the `send_operation` method works as expected."""
     batcher = BatcherClient(queue=queue_mock)
-    agent_metadata = AgentMetadata(agent=Agent(
-        id='01929571-49b5-75e8-a3f6-1d2b84f4f71a',
-        name='test',
-        groups=['group1', 'group2'],
-        type='endpoint',
-        version='5.0.0',
-        host=Host(
-            architecture='x86_64',
-            ip='127.0.0.1',
-            os=OS(
-                name='Debian 12',
-                platform='Linux'
-            )
-        ),
-    ))
-    header = Header(id='1234', module=Module.SCA, operation=Operation.CREATE)
     event = StatefulEvent(data=SCAEvent())
 
-    batcher.send_operation(agent_metadata, header, event)
-    queue_mock.send_to_mux.assert_called_once()
+    batcher.send_operation(AGENT_METADATA, Header(id='1234', module=Module.SCA, operation=Operation.CREATE), event)
+    batcher.send_operation(AGENT_METADATA, Header(id='5678', module=Module.SCA, operation=Operation.CREATE), event)
+    queue_mock.send_many_to_mux.assert_not_called()
+
+    await asyncio.gather(*batcher._sent.values())
+
+    queue_mock.send_many_to_mux.assert_called_once()
+    items = queue_mock.send_many_to_mux.call_args[0][0]
+    assert [item.id for item in items] == ['1234', '5678']
+    assert items[0].content == AGENT_METADATA.model_dump() | event.data.model_dump(exclude_none=True)
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_send_event_delete(queue_mock, reset_submission_dispatcher):
+    """Check that the `send_operation` method sends no content for delete operations."""
+    batcher = BatcherClient(queue=queue_mock)
+
+    batcher.send_operation(AGENT_METADATA, Header(id='1234', module=Module.SCA, operation=Operation.DELETE))
+    await batcher._sent['1234']
+
+    assert queue_mock.send_many_to_mux.call_args[0][0][0].content is None
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_send_event_concurrent_clients(queue_mock, reset_submission_dispatcher):
+    """Check that the items of different clients are sent to the queue together."""
+    event = StatefulEvent(data=SCAEvent())
+    batchers = [BatcherClient(queue=queue_mock), BatcherClient(queue=queue_mock)]
+
+    for item_id, batcher in enumerate(batchers):
+        batcher.send_operation(AGENT_METADATA, Header(id=str(item_id), module=Module.SCA,
+                                                      operation=Operation.CREATE), event)
+
+    await asyncio.gather(*[future for batcher in batchers for future in batcher._sent.values()])
+
+    queue_mock.send_many_to_mux.assert_called_once()
+    assert [item.id for item in queue_mock.send_many_to_mux.call_args[0][0]] == ['0', '1']
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_submission_dispatcher_max_batch(queue_mock):
+    """Check that the `SubmissionDispatcher` sends at most `max_batch` items in each call to the queue."""
+    dispatcher = SubmissionDispatcher(queue=queue_mock, max_batch=2)
+    dispatcher.start()
+
+    futures = [dispatcher.submit(Item(id=str(item_id), operation=Operation.CREATE)) for item_id in range(3)]
+    await asyncio.gather(*futures)
+
+    assert [[item.id for item in c[0][0]] for c in queue_mock.send_many_to_mux.call_args_list] == \
+           [['0', '1'], ['2']]
+    assert all(c[1] == {'timeout': client.SUBMISSION_PUT_TIMEOUT} for c in queue_mock.send_many_to_mux.call_args_list)
+    dispatcher._task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await dispatcher._task
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_submission_dispatcher_executor(queue_mock):
+    """Check that the `SubmissionDispatcher` keeps the event loop running while it waits for the queue."""
+    queue_released = threading.Event()
+    queue_mock.send_many_to_mux.side_effect = lambda *args, **kwargs: queue_released.wait(1)
+    dispatcher = SubmissionDispatcher(queue=queue_mock)
+    dispatcher.start()
+
+    future = dispatcher.submit(Item(id='1', operation=Operation.CREATE))
+    await asyncio.sleep(0.05)
+    assert not future.done()
+
+    queue_released.set()
+    await asyncio.wait_for(future, timeout=1)
+    dispatcher._task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await dispatcher._task
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_get_response_send_error(queue_mock, reset_submission_dispatcher):
+    """Check that the `get_response` method raises the error found sending the item."""
+    batcher = BatcherClient(queue=queue_mock)
+    queue_mock.send_many_to_mux.side_effect = EOFError
+
+    batcher.send_operation(AGENT_METADATA, Header(id='1234', module=Module.SCA, operation=Operation.CREATE),
+                           StatefulEvent(data=SCAEvent()))
+
+    with pytest.raises(EOFError):
+        await batcher.get_response('1234')
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_get_response_queue_full(queue_mock, reset_submission_dispatcher):
+    """Check that the `get_response` method raises queue.Full when the batcher queue stays full."""
+    batcher = BatcherClient(queue=queue_mock)
+    queue_mock.send_many_to_mux.side_effect = queue.Full
+
+    batcher.send_operation(AGENT_METADATA, Header(id='1234', module=Module.SCA, operation=Operation.CREATE),
+                           StatefulEvent(data=SCAEvent()))
+
+    with pytest.raises(queue.Full):
+        await batcher.get_response('1234')
+
+
+@pytest.mark.asyncio
+async def test_get_submission_dispatcher(reset_submission_dispatcher):
+    """Check that the `get_submission_dispatcher` function starts a single dispatcher per event loop."""
+    queue_mock = Mock()
+
+    dispatcher = get_submission_dispatcher(queue_mock)
+    assert dispatcher.is_running()
+    assert get_submission_dispatcher(queue_mock) == dispatcher
+
+    dispatcher._task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await dispatcher._task
+    assert get_submission_dispatcher(queue_mock) != dispatcher
 
 
 @pytest.mark.asyncio
@@ -43,30 +183,86 @@ async def test_get_response(queue_mock):
     event = {"data": "test event"}
     expected_uid = 1234
 
-    queue_mock.is_response_pending.return_value = False
-    queue_mock.receive_from_demux.return_value = event
+    with patch('framework.wazuh.core.batcher.client.get_response_notifier') as get_notifier_mock:
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(event)
+        get_notifier_mock.return_value.register_waiter.return_value = future
 
-    result = await batcher.get_response(expected_uid)
+        result = await batcher.get_response(expected_uid)
 
-    queue_mock.is_response_pending.assert_called_once_with(expected_uid)
+    get_notifier_mock.assert_called_once_with(queue_mock)
+    get_notifier_mock.return_value.register_waiter.assert_called_once_with(expected_uid)
     assert result == event
 
 
 @pytest.mark.asyncio
 @patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
-@patch("asyncio.sleep", new_callable=AsyncMock)
-async def test_get_response_wait(sleep_mock, queue_mock):
-    """Check that the `get_response` method works as expected with no response."""
-    batcher = BatcherClient(queue=queue_mock)
-
+async def test_response_notifier(queue_mock):
+    """Check that the `ResponseNotifier` resolves the futures of the responses available."""
     event = {"data": "test event"}
     expected_uid = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
+    queue_mock.wait_for_responses.side_effect = [(1, {}), (2, {expected_uid: event})] + [(2, {})] * 100
 
-    queue_mock.is_response_pending.side_effect = [True, False]
-    queue_mock.receive_from_demux.return_value = event
-
-    result = await batcher.get_response(expected_uid)
+    notifier = ResponseNotifier(queue=queue_mock, timeout=0.01)
+    notifier.start()
+    result = await asyncio.wait_for(notifier.register_waiter(expected_uid), timeout=1)
 
-    queue_mock.is_response_pending.assert_has_calls([call(expected_uid), call(expected_uid)])
-    sleep_mock.assert_awaited()
+    queue_mock.wait_for_responses.assert_has_calls([call([expected_uid], None, 0.01), call([expected_uid], 1, 0.01)])
     assert result == event
+    assert expected_uid not in notifier._waiters
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_response_notifier_ko(queue_mock):
+    """Check that the `ResponseNotifier` sets the error in the futures it fails to wait for."""
+    expected_uid = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
+    queue_mock.wait_for_responses.side_effect = EOFError
+
+    notifier = ResponseNotifier(queue=queue_mock, timeout=0.01)
+    notifier.start()
+
+    with pytest.raises(EOFError):
+        await asyncio.wait_for(notifier.register_waiter(expected_uid), timeout=1)
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_response_notifier_cancelled(queue_mock):
+    """Check that the `ResponseNotifier` stops waiting for the responses of the cancelled futures."""
+    expected_uid = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
+    notifier = ResponseNotifier(queue=queue_mock, timeout=0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(notifier.register_waiter(expected_uid), timeout=0.01)
+
+    assert notifier._waiters == {}
+
+
+@pytest.mark.asyncio
+@patch("wazuh.core.batcher.mux_demux.MuxDemuxQueue")
+async def test_response_notifier_cancelled_replaced(queue_mock):
+    """Check that cancelling a future does not remove a newer waiter for the same unique identifier."""
+    expected_uid = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
+    notifier = ResponseNotifier(queue=queue_mock, timeout=0.01)
+
+    future = notifier.register_waiter(expected_uid)
+    new_future = notifier.register_waiter(expected_uid)
+    future.cancel()
+    await asyncio.sleep(0)
+
+    assert notifier._waiters == {expected_uid: new_future}
+
+
+@patch('framework.wazuh.core.batcher.client.ResponseNotifier')
+def test_get_response_notifier(notifier_mock):
+    """Check that the `get_response_notifier` function starts a single notifier per process."""
+    queue_mock = Mock()
+    notifier_mock.return_value.is_alive.return_value = True
+
+    with patch('framework.wazuh.core.batcher.client._response_notifier', None):
+        notifier = get_response_notifier(queue_mock)
+        assert get_response_notifier(queue_mock) == notifier
+
+    notifier_mock.assert_called_once_with(queue_mock)
+    notifier_mock.return_value.start.assert_called_once()
@@ -1,14 +1,34 @@
+from datetime import datetime
 from queue import Queue
 from unittest.mock import call, patch, Mock
 
-from framework.wazuh.core.batcher.mux_demux import MuxDemuxQueue, Item, MuxDemuxManager
+from framework.wazuh.core.batcher.mux_demux import MuxDemuxQueue, Item, MuxDemuxManager, ResponseStore
+from framework.wazuh.core.batcher.ring import RING_SIZE
+from wazuh.core.indexer.bulk import Operation
+
+
+def test_item_serialization():
+    """Check that the `Item` serialization to bytes works as expected."""
+    item = Item(
+        id="ac5f7bed-363a-4095-bc19-5c1ebffd1be0",
+        operation=Operation.CREATE,
+        content={"scan_time": datetime(2024, 10, 1, 12, 30), "score": 1},
+        index_name="wazuh-states-sca"
+    )
+
+    result = Item.from_bytes(item.to_bytes())
+
+    assert result.id == item.id
+    assert result.operation == Operation.CREATE.value
+    assert result.content == {"scan_time": "2024-10-01T12:30:00", "score": 1}
+    assert result.index_name == item.index_name
 
 
 def test_send_to_mux():
     """Check that the `send_to_mux` method works as expected."""
     mux_queue = Queue()
     queue = MuxDemuxQueue(
-        proxy_dict=dict(),
+        responses=ResponseStore(),
         mux_queue=mux_queue,
         demux_queue=Queue()
     )
@@ -19,17 +39,36 @@ def test_send_to_mux():
     queue.send_to_mux(Item(id=expected_item_id, content=expected_content, operation='create'))
 
     assert not mux_queue.empty()
-    result = mux_queue.get()
+    result = Item.from_bytes(mux_queue.get())
 
     assert result.id == expected_item_id
     assert result.content == expected_content
 
 
+def test_send_many_to_mux():
+    """Check that the `send_many_to_mux` method works as expected."""
+    mux_queue = Mock()
+    queue = MuxDemuxQueue(
+        responses=ResponseStore(),
+        mux_queue=mux_queue,
+        demux_queue=Queue()
+    )
+
+    expected_ids = ["ac5f7bed-363a-4095-bc19-5c1ebffd1be0", "9f4e2d5b-04a6-4b8a-9d7c-2571d5bd4f28"]
+
+    queue.send_many_to_mux([Item(id=item_id, content="test", operation='create') for item_id in expected_ids],
+                           timeout=1)
+
+    mux_queue.put_many.assert_called_once()
+    assert mux_queue.put_many.call_args[1] == {'block': True, 'timeout': 1}
+    assert [Item.from_bytes(data).id for data in mux_queue.put_many.call_args[0][0]] == expected_ids
+
+
 def test_receive_from_mux():
     """Check that the `receive_from_mux` method works as expected."""
     mux_queue = Queue()
     queue = MuxDemuxQueue(
-        proxy_dict=dict(),
+        responses=ResponseStore(),
         mux_queue=mux_queue,
         demux_queue=Queue()
     )
@@ -37,7 +76,7 @@ def test_receive_from_mux():
     expected_id = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
     expected_content = "test"
 
-    mux_queue.put(Item(id=expected_id, content=expected_content, operation='create'))
+    mux_queue.put(Item(id=expected_id, content=expected_content, operation='create').to_bytes())
 
     result = queue.receive_from_mux()
 
@@ -50,7 +89,7 @@ def test_send_to_demux():
     """Check that the `send_to_demux` method works as expected."""
     demux_queue = Queue()
     queue = MuxDemuxQueue(
-        proxy_dict=dict(),
+        responses=ResponseStore(),
         mux_queue=Queue(),
         demux_queue=demux_queue
     )
@@ -61,52 +100,32 @@ def test_send_to_demux():
     queue.send_to_demux(Item(id=expected_id, content=expected_content, operation='create'))
 
     assert not demux_queue.empty()
-    result = demux_queue.get()
+    result = Item.from_bytes(demux_queue.get())
 
     assert result.id == expected_id
     assert result.content == expected_content
 
 
-def test_is_response_pending():
-    """Check that the `is_response_pending` method works as expected."""
-    dict_test = dict()
-    queue = MuxDemuxQueue(
-        proxy_dict=dict_test,
-        mux_queue=Queue(),
-        demux_queue=Queue()
-    )
-
-    example_uid = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
-    dict_test[example_uid] = "test"
-
-    assert not queue.is_response_pending(example_uid)
-
-
-def test_receive_from_demux():
-    """Check that the `receive_from_demux` method works as expected."""
-    dict_test = dict()
+def test_wait_for_responses():
+    """Check that the `wait_for_responses` method works as expected."""
+    responses = Mock()
     queue = MuxDemuxQueue(
-        proxy_dict=dict_test,
+        responses=responses,
         mux_queue=Queue(),
         demux_queue=Queue()
     )
 
-    example_uid = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
-    example_value = "test"
-    dict_test[example_uid] = example_value
-
-    result = queue.receive_from_demux(example_uid)
+    result = queue.wait_for_responses(["ac5f7bed-363a-4095-bc19-5c1ebffd1be0"], 1, 2)
 
-    assert result is not None
-    assert result == example_value
-    assert example_uid not in dict_test
+    responses.wait_for.assert_called_once_with(["ac5f7bed-363a-4095-bc19-5c1ebffd1be0"], 1, 2)
+    assert result == responses.wait_for.return_value
 
 
 def test_internal_get_response_from_demux():
     """Check that the `internal_get_response_from_demux` method works as expected."""
     demux_queue = Queue()
     queue = MuxDemuxQueue(
-        proxy_dict=dict(),
+        responses=ResponseStore(),
         mux_queue=Queue(),
         demux_queue=demux_queue
     )
@@ -114,7 +133,7 @@ def test_internal_get_response_from_demux():
     expected_id = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
     expected_content = "test"
 
-    demux_queue.put(Item(id=expected_id, content=expected_content, operation='create'))
+    demux_queue.put(Item(id=expected_id, content=expected_content, operation='create').to_bytes())
 
     result = queue.internal_get_response_from_demux()
 
@@ -125,9 +144,9 @@ def test_internal_get_response_from_demux():
 
 def test_internal_store_response():
     """Check that the `internal_store_response` method works as expected."""
-    dict_test = dict()
+    responses = ResponseStore()
     queue = MuxDemuxQueue(
-        proxy_dict=dict_test,
+        responses=responses,
         mux_queue=Queue(),
         demux_queue=Queue()
     )
@@ -137,13 +156,54 @@ def test_internal_store_response():
 
     queue.internal_store_response(Item(id=example_uid, content=example_value, operation='create'))
 
-    assert example_uid in dict_test
-    assert dict_test[example_uid] == example_value
+    assert responses.contains(example_uid)
+    assert responses.pop(example_uid) == example_value
+
+
+def test_response_store_wait_for():
+    """Check that the `ResponseStore.wait_for` method returns the available responses."""
+    responses = ResponseStore()
+
+    example_uid = "ac5f7bed-363a-4095-bc19-5c1ebffd1be0"
+    example_value = "test"
+    responses.add(example_uid, example_value)
+
+    version, result = responses.wait_for([example_uid, "other"], last_version=1, timeout=0)
 
+    assert version == 1
+    assert result == {example_uid: example_value}
+    assert not responses.contains(example_uid)
 
+
+def test_response_store_wait_for_new_version():
+    """Check that the `ResponseStore.wait_for` method returns without waiting if there are new responses."""
+    responses = ResponseStore()
+    responses.add("other", "test")
+
+    with patch.object(responses._condition, 'wait') as wait_mock:
+        version, result = responses.wait_for(["ac5f7bed-363a-4095-bc19-5c1ebffd1be0"], last_version=None)
+
+    wait_mock.assert_not_called()
+    assert version == 1
+    assert result == {}
+
+
+def test_response_store_wait_for_timeout():
+    """Check that the `ResponseStore.wait_for` method waits for new responses up to the timeout."""
+    responses = ResponseStore()
+
+    with patch.object(responses._condition, 'wait') as wait_mock:
+        version, result = responses.wait_for(["ac5f7bed-363a-4095-bc19-5c1ebffd1be0"], last_version=0, timeout=1)
+
+    wait_mock.assert_called_once_with(1)
+    assert version == 0
+    assert result == {}
+
+
+@patch('framework.wazuh.core.batcher.mux_demux.SharedMemoryRing')
 @patch('framework.wazuh.core.batcher.mux_demux.SyncManager')
 @patch('framework.wazuh.core.batcher.mux_demux.MuxDemuxRunner')
-def test_mux_demux_manager_initialization(mux_demux_runner_mock, sync_manager_mock):
+def test_mux_demux_manager_initialization(mux_demux_runner_mock, sync_manager_mock, ring_mock):
     """Check that the `MuxDemuxManager.__init___` method works as expected."""
     manager_mock = Mock()
     sync_manager_mock.return_value = manager_mock
@@ -151,23 +211,23 @@ def test_mux_demux_manager_initialization(mux_demux_runner_mock, sync_manager_mo
     runner_mock = Mock()
     mux_demux_runner_mock.return_value = runner_mock
 
-    MuxDemuxManager()
+    manager = MuxDemuxManager()
 
     manager_mock.assert_has_calls([
         call.start(),
-        call.dict(),
-        call.Queue(),
-        call.Queue(),
-        call.MuxDemuxQueue(manager_mock.dict(), manager_mock.Queue(), manager_mock.Queue()),
+        call.ResponseStore(),
     ])
+    assert manager.get_queue().responses == manager_mock.ResponseStore.return_value
+    assert ring_mock.call_args_list == [call(RING_SIZE), call(RING_SIZE)]
     runner_mock.assert_has_calls([
         call.start(),
     ])
 
 
+@patch('framework.wazuh.core.batcher.mux_demux.SharedMemoryRing')
 @patch('framework.wazuh.core.batcher.mux_demux.SyncManager')
 @patch('framework.wazuh.core.batcher.mux_demux.MuxDemuxRunner')
-def test_mux_demux_manager_shutdown(mux_demux_runner_mock, sync_manager_mock):
+def test_mux_demux_manager_shutdown(mux_demux_runner_mock, sync_manager_mock, ring_mock):
     """Check that the `shutdown` method works as expected."""
     manager_mock = Mock()
     sync_manager_mock.return_value = manager_mock
@@ -180,13 +240,11 @@ def test_mux_demux_manager_shutdown(mux_demux_runner_mock, sync_manager_mock):
 
     manager_mock.assert_has_calls([
         call.start(),
-        call.dict(),
-        call.Queue(),
-        call.Queue(),
-        call.MuxDemuxQueue(manager_mock.dict(), manager_mock.Queue(), manager_mock.Queue()),
+        call.ResponseStore(),
         call.shutdown()
     ])
     runner_mock.assert_has_calls([
         call.start(),
         call.terminate()
     ])
+    ring_mock.return_value.close.assert_called()
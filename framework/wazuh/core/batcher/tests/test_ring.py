@@ -0,0 +1,145 @@
+import queue
+from multiprocessing import Process
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import patch
+
+import pytest
+
+from framework.wazuh.core.batcher.ring import SharedMemoryRing, RECORD_LENGTH
+
+
+@pytest.fixture
+def ring():
+    ring = SharedMemoryRing(size=64)
+    yield ring
+    ring.close()
+
+
+@patch('framework.wazuh.core.batcher.ring.os.posix_fallocate', side_effect=OSError(28, 'No space left on device'))
+def test_ring_no_space(fallocate_mock):
+    """Check that the ring creation fails, and releases the segment, when /dev/shm has not enough free space."""
+    segments = []
+
+    def create_segment(**kwargs):
+        segments.append(SharedMemory(**kwargs))
+        return segments[-1]
+
+    with patch('framework.wazuh.core.batcher.ring.SharedMemory', side_effect=create_segment):
+        with pytest.raises(OSError):
+            SharedMemoryRing(size=64)
+
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=segments[0].name)
+
+
+def test_put_get(ring):
+    """Check that the records written into the ring are read in the same order."""
+    ring.put(b'first')
+    ring.put_many([b'second', b''])
+
+    assert not ring.empty()
+    assert ring.get() == b'first'
+    assert ring.get() == b'second'
+    assert ring.get() == b''
+    assert ring.empty()
+
+
+def test_put_get_wrap_around(ring):
+    """Check that the records are kept when they wrap around the end of the ring."""
+    data = bytes(range(40))
+    for _ in range(5):
+        ring.put(data)
+        assert ring.get() == data
+
+
+def test_get_empty(ring):
+    """Check that the `get` method raises queue.Empty when there are no records."""
+    with pytest.raises(queue.Empty):
+        ring.get(block=False)
+
+    with pytest.raises(queue.Empty):
+        ring.get(timeout=0.01)
+
+
+def test_get_locked(ring):
+    """Check that the `get` method raises queue.Empty when the lock is not released in time."""
+    ring.put(b'a')
+    ring._not_empty.acquire()
+    try:
+        with pytest.raises(queue.Empty):
+            ring.get(block=False)
+
+        with pytest.raises(queue.Empty):
+            ring.get(timeout=0.01)
+    finally:
+        ring._not_empty.release()
+
+    assert ring.get() == b'a'
+
+
+def test_put_full(ring):
+    """Check that the `put` method raises queue.Full when there is no free space."""
+    ring.put(b'a' * (64 - RECORD_LENGTH.size))
+
+    with pytest.raises(queue.Full):
+        ring.put(b'b', block=False)
+
+    with pytest.raises(queue.Full):
+        ring.put(b'b', timeout=0.01)
+
+
+def test_put_too_big(ring):
+    """Check that the `put` method rejects records bigger than the ring."""
+    with pytest.raises(ValueError):
+        ring.put(b'a' * 64)
+
+
+def test_put_many_full(ring):
+    """Check that the `put_many` method writes none of the records when they do not fit in the free space."""
+    ring.put(b'a' * 32)
+
+    with pytest.raises(queue.Full):
+        ring.put_many([b'b', b'c' * 20], timeout=0.01)
+
+    assert ring.get() == b'a' * 32
+    assert ring.empty()
+
+
+def test_put_many_too_big(ring):
+    """Check that the `put_many` method rejects records bigger than the ring altogether."""
+    with pytest.raises(ValueError):
+        ring.put_many([b'a' * 32, b'b' * 32])
+
+    assert ring.empty()
+
+
+def test_put_many_locked(ring):
+    """Check that the `put_many` method raises queue.Full when the lock is not released in time."""
+    ring._not_full.acquire()
+    try:
+        with pytest.raises(queue.Full):
+            ring.put_many([b'a'], block=False)
+
+        with pytest.raises(queue.Full):
+            ring.put_many([b'a'], timeout=0.01)
+    finally:
+        ring._not_full.release()
+
+    assert ring.empty()
+
+
+def _put_records(ring: SharedMemoryRing, records: list):
+    for record in records:
+        ring.put(record)
+
+
+def test_put_get_processes(ring):
+    """Check that the records written by a forked process are read by the parent process."""
+    records = [str(i).encode() * 10 for i in range(50)]
+    process = Process(target=_put_records, args=(ring, records))
+    process.start()
+
+    result = [ring.get(timeout=5) for _ in records]
+    process.join()
+
+    assert result == records
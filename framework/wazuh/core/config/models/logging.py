@@ -1,6 +1,7 @@
 import logging
+import re
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr, model_validator
 from typing import List
 from enum import Enum
 
@@ -29,6 +30,29 @@ class APILoggingLevel(str, Enum):
     critical = "critical"
 
 
+_VALUE_MAP = {
+    LoggingLevel.info: 0,
+    LoggingLevel.debug: 1,
+    LoggingLevel.debug2: 2,
+}
+
+_SIZE_PATTERN = r"^([1-9]\d*)([KM])$"
+_SIZE_RE = re.compile(_SIZE_PATTERN)
+
+_UNIT_BYTES = {
+    'K': 1024,
+    'M': 1024 ** 2,
+}
+
+_LEVEL_MAP = {
+    APILoggingLevel.debug: logging.DEBUG,
+    APILoggingLevel.info: logging.INFO,
+    APILoggingLevel.warning: logging.WARNING,
+    APILoggingLevel.error: logging.ERROR,
+    APILoggingLevel.critical: logging.CRITICAL,
+}
+
+
 class LoggingConfig(WazuhConfigBaseModel):
     """Configuration for logging levels.
 
@@ -50,12 +74,7 @@ class LoggingConfig(WazuhConfigBaseModel):
             - 1 for "debug"
             - 2 for "debug2"
         """
-        if self.level == LoggingLevel.info:
-            return 0
-        if self.level == LoggingLevel.debug:
-            return 1
-
-        return 2
+        return _VALUE_MAP[self.level]
 
 
 class LogFileMaxSizeConfig(WazuhConfigBaseModel):
@@ -69,7 +88,31 @@ class LogFileMaxSizeConfig(WazuhConfigBaseModel):
         The maximum size of the log file. Supports 'M' for megabytes and 'K' for kilobytes. Default is "1M".
     """
     enabled: bool = False
-    size: str = Field(default="1M", pattern=r"^([1-9]\d*)([KM])$")
+    size: str = Field(default="1M", pattern=_SIZE_PATTERN)
+    _size_bytes: int = PrivateAttr(_UNIT_BYTES['M'])
+
+    @model_validator(mode='after')
+    def set_size_bytes(self) -> 'LogFileMaxSizeConfig':
+        """Store the size value in bytes so it is not parsed on every access.
+
+        Returns
+        -------
+        LogFileMaxSizeConfig
+            The validated configuration.
+        """
+        size, unit = _SIZE_RE.match(self.size).groups()
+        self._size_bytes = int(size) * _UNIT_BYTES[unit]
+        return self
+
+    def get_size_bytes(self) -> int:
+        """Returns the maximum size of the log file in bytes.
+
+        Returns
+        -------
+        int
+            The maximum size in bytes.
+        """
+        return self._size_bytes
 
 
 class RotatedLoggingConfig(WazuhConfigBaseModel):
@@ -87,6 +130,19 @@ class RotatedLoggingConfig(WazuhConfigBaseModel):
     level: APILoggingLevel = APILoggingLevel.debug
     format: List[LoggingFormat] = Field(default=[LoggingFormat.plain], min_length=1)
     max_size: LogFileMaxSizeConfig = LogFileMaxSizeConfig()
+    _level_int: int = PrivateAttr(logging.ERROR)
+
+    @model_validator(mode='after')
+    def set_level_int(self) -> 'RotatedLoggingConfig':
+        """Store the integer value of the logging level so it is not computed on every access.
+
+        Returns
+        -------
+        RotatedLoggingConfig
+            The validated configuration.
+        """
+        self._level_int = _LEVEL_MAP.get(self.level, logging.ERROR)
+        return self
 
     def get_level(self) -> int:
         """Returns the integer value corresponding to the logging level.
@@ -101,15 +157,4 @@ class RotatedLoggingConfig(WazuhConfigBaseModel):
             - logging.ERROR for "error"
             - logging.CRITICAL for "critical"
         """
-        if self.level == APILoggingLevel.debug:
-            return logging.DEBUG
-        elif self.level == APILoggingLevel.info:
-            return logging.INFO
-        elif self.level == APILoggingLevel.warning:
-            return logging.WARNING
-        elif self.level == APILoggingLevel.error:
-            return logging.ERROR
-        elif self.level == APILoggingLevel.critical:
-            return logging.CRITICAL
-        else:
-            return logging.ERROR
+        return self._level_int
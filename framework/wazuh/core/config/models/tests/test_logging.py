@@ -65,6 +65,16 @@ def test_log_file_max_size_config_invalid_values(value):
         _ = LogFileMaxSizeConfig(size=value)
 
 
+@pytest.mark.parametrize("size, expected", [
+    ("1M", 1024 ** 2),
+    ("20K", 20 * 1024),
+    ("3M", 3 * 1024 ** 2),
+])
+def test_log_file_max_size_config_get_size_bytes(size, expected):
+    """Check the correct behavior of the `get_size_bytes` method."""
+    assert LogFileMaxSizeConfig(size=size).get_size_bytes() == expected
+
+
 @pytest.mark.parametrize("init_values, expected", [
     ({}, {"level": APILoggingLevel.debug, "format": [LoggingFormat.plain], "max_size": {}}),
     ({"level": APILoggingLevel.info, "format": [LoggingFormat.plain, LoggingFormat.json], "max_size": {"size": "3M"}},
@@ -103,3 +113,11 @@ def test_get_level(value, expected):
     config = RotatedLoggingConfig(level=value)
 
     assert config.get_level() == expected
+
+
+def test_get_level_model_copy():
+    """Check that the logging level value is kept when the `RotatedLoggingConfig` is copied or validated again."""
+    config = RotatedLoggingConfig(level=APILoggingLevel.warning)
+
+    assert config.model_copy().get_level() == logging.WARNING
+    assert RotatedLoggingConfig.model_validate(config.model_dump()).get_level() == logging.WARNING
@@ -1,8 +1,9 @@
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, List, Optional, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 
 from wazuh.core.exception import WazuhError
 from wazuh.core.indexer.bulk import Operation
@@ -37,6 +38,22 @@ class AgentMetadata(BaseModel):
     """Agent metadata."""
     agent: Agent
 
+    _dump: Optional[dict] = PrivateAttr(None)
+
+    def cached_dump(self) -> dict:
+        """Get the metadata dictionary, generating it only the first time, as it is the same for all the
+        events of the agent.
+
+        Returns
+        -------
+        dict
+            Shallow copy of the metadata dictionary.
+        """
+        if self._dump is None:
+            self._dump = self.model_dump()
+
+        return dict(self._dump)
+
 
 class TaskResult(BaseModel):
     """Stateful event bulk task result data model."""
@@ -265,6 +282,7 @@ STATEFUL_EVENTS_INDICES: Dict[Module, str] = {
 }
 
 
+@lru_cache(maxsize=256)
 def get_module_index_name(module: Module, type: Optional[str] = None) -> str:
     """Get the index name corresponding to the specified module and type.
 
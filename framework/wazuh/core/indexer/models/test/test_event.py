@@ -1,10 +1,13 @@
+from unittest.mock import patch
+
 import pytest
 
 from wazuh.core.exception import WazuhError
 from wazuh.core.indexer.models.events import get_module_index_name, Module, FIM_INDEX, SCA_INDEX, \
     VULNERABILITY_INDEX, INVENTORY_NETWORK_INDEX, INVENTORY_PACKAGES_INDEX, INVENTORY_PROCESSES_INDEX, \
     INVENTORY_SYSTEM_INDEX, INVENTORY_NETWORK_TYPE, INVENTORY_PACKAGES_TYPE, INVENTORY_PROCESSES_TYPE, \
-    INVENTORY_SYSTEM_TYPE, CommandsManager
+    INVENTORY_SYSTEM_TYPE, CommandsManager, AgentMetadata, Agent
+from wazuh.core.indexer.models.agent import Host, OS
 
 
 @pytest.mark.parametrize('module, type, expected_name', [
@@ -24,6 +27,16 @@ def test_get_module_index_name(module, type, expected_name):
     assert actual_name == expected_name
 
 
+def test_get_module_index_name_cache():
+    """Validate that the `get_module_index_name` results are cached."""
+    get_module_index_name.cache_clear()
+
+    get_module_index_name(Module.SCA, None)
+    get_module_index_name(Module.SCA, None)
+
+    assert get_module_index_name.cache_info().hits == 1
+
+
 @pytest.mark.parametrize('module, type, exception', [
     (Module.INVENTORY, 'invalid', 1763),
     ('test', 'package', 1765),
@@ -32,3 +45,20 @@ def test_get_module_index_name_ko(module, type, exception):
     """Validate that the `get_module_index_name` fails if the module is not valid."""
     with pytest.raises(WazuhError, match=rf'{exception}'):
         get_module_index_name(module, type)
+
+
+def test_agent_metadata_cached_dump():
+    """Validate that the `AgentMetadata.cached_dump` method serializes the model only once."""
+    agent_metadata = AgentMetadata(agent=Agent(
+        id='01929571-49b5-75e8-a3f6-1d2b84f4f71a', name='test', groups=['group1'], type='endpoint', version='5.0.0',
+        host=Host(architecture='x86_64', ip='127.0.0.1', os=OS(name='Debian 12', platform='Linux'))
+    ))
+    expected = agent_metadata.model_dump()
+
+    with patch.object(AgentMetadata, 'model_dump', return_value=expected) as model_dump_mock:
+        first = agent_metadata.cached_dump()
+        first['test'] = 'value'
+        second = agent_metadata.cached_dump()
+
+    model_dump_mock.assert_called_once()
+    assert second == expected